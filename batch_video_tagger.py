@@ -6,160 +6,482 @@ Processes videos from input directory and organizes them into processed/output d
 
 import os
 import sys
+import errno
+import hashlib
 import json
+import re
 import argparse
+import asyncio
 import shutil
+import subprocess
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from simple_video_tagger import SimpleVideoTagger
+from typing import Callable, Dict, Any, Literal, Optional, List, Tuple
+from simple_video_tagger import SimpleVideoTagger, json_loads
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows; reflink cloning is skipped there
+    fcntl = None
+
+# Matches file names with a known video extension, case-insensitively,
+# without lowercasing or splitting each name
+_VIDEO_RE = re.compile(r'\.(?:mp4|avi|mov|mkv|wmv|flv|webm|m4v)$', re.IGNORECASE)
+_SEP60 = '=' * 60
+
+# Tag holding a hash of the metadata written, so unchanged videos can be skipped on re-runs
+_HASH_TAG = '_tagger_hash'
+
+
+# ioctl request number for FICLONE (Linux btrfs/XFS reflink copy)
+_FICLONE = 0x40049409
+
+
+def _clone_file(src: Path, dst: Path):
+    """Copy a file, sharing its data blocks with the source when the filesystem supports reflinks."""
+    if fcntl is not None:
+        try:
+            with open(src, 'rb') as src_f, open(dst, 'wb') as dst_f:
+                fcntl.ioctl(dst_f.fileno(), _FICLONE, src_f.fileno())
+            return
+        except OSError:
+            pass  # No reflink support here, do a regular copy
+    shutil.copyfile(str(src), str(dst))
+
+
+def _fast_move(src: Path, dst: Path):
+    """Move a file with a rename when possible, only copying across filesystems.
+
+    Like ``shutil.move``, an existing ``dst`` is overwritten.
+    """
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        # A reflink cannot cross filesystems either, so copy straight away
+        shutil.copy2(str(src), str(dst))
+        os.unlink(src)
+
+
+# One reusable tagger per worker thread/process, rebound to each video
+_local = threading.local()
+
+
+def _get_tagger() -> SimpleVideoTagger:
+    """Return this thread's tagger, creating it on first use."""
+    tagger = getattr(_local, 'tagger', None)
+    if tagger is None:
+        tagger = _local.tagger = SimpleVideoTagger()
+    return tagger
+
+
+def _process_one(video_path: Path, metadata: Dict[str, Any], output_dir: Path, processed_dir: Path,
+                 quiet: bool = False) -> bool:
+    """Tag a single video and move the original to the processed directory.
+
+    Kept at module level so it can be pickled and run in worker processes.
+    With ``quiet`` only errors are reported.
+    """
+    name = video_path.name
+    try:
+        if not quiet:
+            sys.stdout.write(f"\n{_SEP60}\nProcessing: {name}\n{_SEP60}\n")
+        
+        # Point the shared tagger at this video
+        tagger = _get_tagger().bind(str(video_path))
+        
+        # Apply auto-title loading (returns a copy, the shared dict is left untouched)
+        metadata = _with_content_hash(tagger.load_metadata_with_auto_title(metadata), video_path)
+        
+        # Create output filename
+        output_path = output_dir / f"{video_path.stem}_tagged{video_path.suffix}"
+        output_str = str(output_path)
+        
+        if _is_up_to_date(output_path, metadata[_HASH_TAG]):
+            if not quiet:
+                print(f"✓ Skipping {name}: {output_path.name} is up to date")
+            return _finish_one(video_path, True, metadata, output_path, processed_dir, quiet=True)
+        
+        # Write metadata. When the container supports it, copy the file once
+        # and patch the tags in the copy instead of remuxing every byte.
+        if not quiet:
+            print(f"Adding metadata to: {output_path.name}")
+        if tagger.can_write_inplace():
+            success = _clone_and_patch(video_path, output_path, metadata, quiet, tagger)
+        else:
+            success = tagger.write_metadata(metadata, output_str, quiet)
+        
+        return _finish_one(video_path, success, metadata, output_path, processed_dir, quiet)
+            
+    except Exception as e:
+        print(f"✗ Error processing {name}: {e}")
+        return False
+
+
+async def _process_one_async(video_path: Path, metadata: Dict[str, Any], output_dir: Path, processed_dir: Path,
+                             quiet: bool = False) -> bool:
+    """asyncio version of _process_one that awaits ffmpeg instead of blocking on it."""
+    name = video_path.name
+    try:
+        if not quiet:
+            sys.stdout.write(f"\n{_SEP60}\nProcessing: {name}\n{_SEP60}\n")
+        
+        # A tagger of its own: other videos are handled while this one waits
+        tagger = SimpleVideoTagger(str(video_path))
+        metadata = _with_content_hash(tagger.load_metadata_with_auto_title(metadata), video_path)
+        
+        output_path = output_dir / f"{video_path.stem}_tagged{video_path.suffix}"
+        output_str = str(output_path)
+        
+        if await asyncio.to_thread(_is_up_to_date, output_path, metadata[_HASH_TAG]):
+            if not quiet:
+                print(f"✓ Skipping {name}: {output_path.name} is up to date")
+            return await asyncio.to_thread(_finish_one, video_path, True, metadata, output_path,
+                                           processed_dir, quiet=True)
+        
+        if not quiet:
+            print(f"Adding metadata to: {output_path.name}")
+        if tagger.can_write_inplace():
+            # Copying and patching is plain file I/O, keep it off the event loop
+            success = await asyncio.to_thread(_clone_and_patch, video_path, output_path, metadata, quiet)
+        else:
+            success = await _run_ffmpeg_async(tagger.build_write_command(metadata, output_str))
+            if success and not quiet:
+                print(f"✓ Metadata written successfully to: {output_str}")
+        
+        # Moving across filesystems copies the whole file, so keep that off the event loop too
+        return await asyncio.to_thread(_finish_one, video_path, success, metadata, output_path,
+                                       processed_dir, quiet)
+            
+    except Exception as e:
+        print(f"✗ Error processing {name}: {e}")
+        return False
+
+
+def _format_duration(seconds: float) -> str:
+    """Format a duration in seconds as H:MM:SS or M:SS."""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+def _with_content_hash(metadata: Dict[str, Any], video_path: Path) -> Dict[str, Any]:
+    """Add the _tagger_hash tag for the given metadata (the dict is modified in place).
+    
+    The source file's size and mtime are hashed too, so a video replaced
+    under the same name is tagged again instead of counted as up to date.
+    """
+    st = video_path.stat()
+    payload = json.dumps([metadata, st.st_size, st.st_mtime_ns],
+                         sort_keys=True, ensure_ascii=False).encode('utf-8')
+    metadata[_HASH_TAG] = hashlib.blake2b(payload, digest_size=8).hexdigest()
+    return metadata
+
+
+def _is_up_to_date(output_path: Path, content_hash: str) -> bool:
+    """Check whether an existing output file was already tagged with this exact metadata."""
+    if not output_path.exists():
+        return False
+    try:
+        tags = SimpleVideoTagger(str(output_path)).read_metadata()
+    except Exception:
+        return False
+    # Matroska stores tag names in upper case
+    return any(k.lower() == _HASH_TAG and v == content_hash for k, v in tags.items())
+
+
+def _clone_and_patch(video_path: Path, output_path: Path, metadata: Dict[str, Any],
+                     quiet: bool = False, tagger: Optional[SimpleVideoTagger] = None) -> bool:
+    """Copy a video to its output path and write the tags into the copy.
+    
+    If the copy cannot be tagged it is removed again, so no untagged file is
+    left behind looking like output.
+    """
+    _clone_file(video_path, output_path)
+    tagger = (tagger or SimpleVideoTagger()).bind(str(output_path))
+    if tagger.write_metadata_inplace(metadata, quiet):
+        return True
+    output_path.unlink(missing_ok=True)
+    return False
+
+
+async def _run_ffmpeg_async(cmd: list) -> bool:
+    """Run an ffmpeg command as an asyncio subprocess, reporting its error if it fails."""
+    # With -loglevel error a successful run writes nothing, so stderr stays tiny
+    proc = await asyncio.create_subprocess_exec(cmd[0], '-nostats', '-loglevel', 'error', *cmd[1:],
+                                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    _, stderr = await proc.communicate()
+    if proc.returncode == 0:
+        return True
+    print(f"ffmpeg error: {stderr.decode(errors='replace')}")
+    return False
+
+
+def _finish_one(video_path: Path, success: bool, metadata: Dict[str, Any], output_path: Path,
+                processed_dir: Path, quiet: bool) -> bool:
+    """Move a tagged video's original to the processed directory and report the result."""
+    name = video_path.name
+    if not success:
+        print(f"✗ Failed to process: {name}")
+        return False
+    
+    # Move original to processed directory, replacing a copy left by an earlier run
+    processed_path = processed_dir / name
+    _fast_move(video_path, processed_path)
+    
+    if not quiet:
+        # Report, including the metadata that was added, in one write
+        lines = [
+            f"✓ Successfully processed: {name}\n",
+            f"  Original moved to: {processed_path}\n",
+            f"  Tagged video saved to: {output_path}\n",
+            "\nMetadata added:\n",
+        ]
+        lines.extend(f"  {key:15}: {value}\n" for key, value in metadata.items())
+        sys.stdout.write("".join(lines))
+    
+    return True
 
 
 class BatchVideoTagger:
     """A class to handle batch video metadata tagging with directory organization."""
     
-    def __init__(self, input_dir: str = "input", processed_dir: str = "processed", output_dir: str = "output"):
+    def __init__(self, input_dir: str = "input", processed_dir: str = "processed", output_dir: str = "output",
+                 quiet: bool = False):
         self.input_dir = Path(input_dir)
         self.processed_dir = Path(processed_dir)
         self.output_dir = Path(output_dir)
+        self.quiet = quiet
         
         # Create directories if they don't exist
         self.input_dir.mkdir(exist_ok=True)
         self.processed_dir.mkdir(exist_ok=True)
         self.output_dir.mkdir(exist_ok=True)
+        
+        # Parsed metadata files keyed by (path, mtime)
+        self._metadata_cache: Dict[Tuple[str, float], Dict[str, Any]] = {}
+    
+    def _load_metadata(self, path: str) -> Dict[str, Any]:
+        """Load a metadata JSON file, reusing the parsed result while the file is unchanged."""
+        key = (path, os.stat(path).st_mtime)
+        metadata = self._metadata_cache.get(key)
+        if metadata is None:
+            metadata = json_loads(Path(path).read_bytes())
+            self._metadata_cache[key] = metadata
+        return metadata
     
-    def get_video_files(self) -> List[Path]:
-        """Get all video files from the input directory."""
-        video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.webm', '.m4v'}
-        video_files = []
+    def get_video_files(self, order: Literal['name', 'size_desc'] = 'name') -> List[Path]:
+        """Get all video files from the input directory.
+        
+        ``order='size_desc'`` returns the largest files first, so a worker pool
+        does not end up waiting on one big file started last.
+        """
+        entries_found = []
         
-        for file_path in self.input_dir.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in video_extensions:
-                video_files.append(file_path)
+        # DirEntry.is_file() is answered from the directory listing, so this
+        # avoids a stat() per entry
+        with os.scandir(self.input_dir) as entries:
+            for entry in entries:
+                if _VIDEO_RE.search(entry.name) and entry.is_file(follow_symlinks=False):
+                    entries_found.append(entry)
         
-        return sorted(video_files)
+        if order == 'size_desc':
+            entries_found.sort(key=lambda e: (-e.stat(follow_symlinks=False).st_size, e.name))
+        else:
+            entries_found.sort(key=lambda e: e.name)
+        return [Path(entry.path) for entry in entries_found]
     
-    def process_single_video(self, video_path: Path, metadata_file: str = "sample_metadata.json") -> bool:
-        """Process a single video file."""
-        try:
-            print(f"\n{'='*60}")
-            print(f"Processing: {video_path.name}")
-            print(f"{'='*60}")
-            
-            # Create tagger instance
-            tagger = SimpleVideoTagger(str(video_path))
-            
-            # Load metadata from JSON file
-            metadata_path = Path(metadata_file)
-            if not metadata_path.exists():
+    def process_single_video(self, video_path: Path, metadata_file: str = "sample_metadata.json",
+                             metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """Process a single video file.
+        
+        ``metadata`` is the already-parsed metadata; if omitted it is loaded from ``metadata_file``.
+        """
+        if metadata is None:
+            if not Path(metadata_file).exists():
                 print(f"Error: Metadata file '{metadata_file}' not found")
                 return False
-            
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-            
-            # Apply auto-title loading
-            metadata = tagger.load_metadata_with_auto_title(metadata)
-            
-            # Create output filename
-            output_filename = f"{video_path.stem}_tagged{video_path.suffix}"
-            output_path = self.output_dir / output_filename
-            
-            # Write metadata
-            print(f"Adding metadata to: {output_filename}")
-            success = tagger.write_metadata(metadata, str(output_path))
-            
-            if success:
-                # Move original to processed directory
-                processed_path = self.processed_dir / video_path.name
-                shutil.move(str(video_path), str(processed_path))
-                
-                print(f"✓ Successfully processed: {video_path.name}")
-                print(f"  Original moved to: {processed_path}")
-                print(f"  Tagged video saved to: {output_path}")
-                
-                # Display the metadata that was added
-                print(f"\nMetadata added:")
-                for key, value in metadata.items():
-                    print(f"  {key:15}: {value}")
-                
-                return True
-            else:
-                print(f"✗ Failed to process: {video_path.name}")
-                return False
-                
-        except Exception as e:
-            print(f"✗ Error processing {video_path.name}: {e}")
-            return False
+            metadata = self._load_metadata(metadata_file)
+        return _process_one(video_path, metadata, self.output_dir, self.processed_dir, self.quiet)
     
-    def process_all_videos(self, metadata_file: str = "sample_metadata.json") -> Dict[str, bool]:
-        """Process all videos in the input directory."""
-        video_files = self.get_video_files()
+    async def process_single_video_async(self, video_path: Path, metadata: Dict[str, Any]) -> bool:
+        """Process a single video file, awaiting its ffmpeg run."""
+        return await _process_one_async(video_path, metadata, self.output_dir, self.processed_dir, self.quiet)
+    
+    def process_all_videos(self, metadata_file: str = "sample_metadata.json",
+                           workers: Optional[int] = None,
+                           executor: Optional[Executor] = None) -> Dict[str, bool]:
+        """Process all videos in the input directory.
+        
+        Videos are tagged concurrently, one ffmpeg process per worker. ``workers``
+        sets the pool size (default: number of CPUs); pass ``executor`` to run
+        the jobs on an existing executor instead of a new process pool.
+        """
+        parallel = executor is not None or (workers or os.cpu_count() or 1) > 1
+        video_files, metadata = self._start_batch(metadata_file, 'size_desc' if parallel else 'name')
+        if metadata is None:
+            return {video_file.name: False for video_file in video_files}
+        
+        results = {}
+        pool = executor or ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = {
+                pool.submit(_process_one, video_file, metadata, self.output_dir, self.processed_dir,
+                            self.quiet): video_file
+                for video_file in video_files
+            }
+            for future in as_completed(futures):
+                video_file = futures[future]
+                try:
+                    success = future.result()
+                except Exception as e:
+                    print(f"✗ Error processing {video_file.name}: {e}")
+                    success = False
+                results[video_file.name] = success
+        finally:
+            if executor is None:
+                pool.shutdown()
+        
+        self._print_summary(results)
+        return results
+    
+    async def process_all_videos_async(self, metadata_file: str = "sample_metadata.json",
+                                       workers: Optional[int] = None) -> Dict[str, bool]:
+        """Process all videos from one thread with asyncio.
+        
+        Up to ``workers`` (default: number of CPUs) ffmpeg processes run at a
+        time, without the process pool's fork and pickling overhead.
+        """
+        limit = workers or os.cpu_count() or 1
+        video_files, metadata = self._start_batch(metadata_file, 'size_desc' if limit > 1 else 'name')
+        if metadata is None:
+            return {video_file.name: False for video_file in video_files}
+        
+        semaphore = asyncio.Semaphore(limit)
+        
+        async def run(video_file: Path) -> bool:
+            async with semaphore:
+                return await self.process_single_video_async(video_file, metadata)
+        
+        outcomes = await asyncio.gather(*(run(video_file) for video_file in video_files))
+        results = {video_file.name: success for video_file, success in zip(video_files, outcomes)}
+        
+        self._print_summary(results)
+        return results
+    
+    def _start_batch(self, metadata_file: str,
+                     order: Literal['name', 'size_desc'] = 'name') -> Tuple[List[Path], Optional[Dict[str, Any]]]:
+        """List the videos to process and load the metadata; metadata is None if there is nothing to do."""
+        video_files = self.get_video_files(order)
         
         if not video_files:
             print(f"No video files found in {self.input_dir}")
-            return {}
+            return video_files, None
         
-        print(f"Found {len(video_files)} video(s) to process:")
-        for video_file in video_files:
-            print(f"  - {video_file.name}")
+        if self.quiet:
+            print(f"Found {len(video_files)} video(s) to process")
+        else:
+            lines = [f"Found {len(video_files)} video(s) to process:\n"]
+            lines.extend(f"  - {video_file.name}\n" for video_file in video_files)
+            sys.stdout.write("".join(lines))
         
-        results = {}
-        successful = 0
-        failed = 0
+        if not Path(metadata_file).exists():
+            print(f"Error: Metadata file '{metadata_file}' not found")
+            return video_files, None
+        return video_files, self._load_metadata(metadata_file)
+    
+    def _print_summary(self, results: Dict[str, bool]):
+        """Print the processing summary for a finished batch."""
+        successful = sum(1 for success in results.values() if success)
+        failed = len(results) - successful
+        lines = [
+            f"\n{_SEP60}\n",
+            "PROCESSING SUMMARY\n",
+            f"{_SEP60}\n",
+            f"Total videos: {len(results)}\n",
+            f"Successful: {successful}\n",
+            f"Failed: {failed}\n",
+            f"Success rate: {(successful/len(results)*100):.1f}%\n",
+        ]
         
-        for video_file in video_files:
-            success = self.process_single_video(video_file, metadata_file)
-            results[video_file.name] = success
-            
-            if success:
-                successful += 1
-            else:
-                failed += 1
+        if failed > 0:
+            lines.append("\nFailed videos:\n")
+            lines.extend(f"  - {video_name}\n" for video_name, success in results.items() if not success)
         
-        # Summary
-        print(f"\n{'='*60}")
-        print(f"PROCESSING SUMMARY")
-        print(f"{'='*60}")
-        print(f"Total videos: {len(video_files)}")
-        print(f"Successful: {successful}")
-        print(f"Failed: {failed}")
-        print(f"Success rate: {(successful/len(video_files)*100):.1f}%")
+        sys.stdout.write("".join(lines))
+    
+    def probe_all(self, paths: List[Path], workers: Optional[int] = None) -> Dict[Path, Dict[str, Any]]:
+        """Probe several videos at once, returning ffprobe info for each file that could be read.
         
-        if failed > 0:
-            print(f"\nFailed videos:")
-            for video_name, success in results.items():
-                if not success:
-                    print(f"  - {video_name}")
+        ffprobe takes a single input per run, so the runs are overlapped on a
+        thread pool instead; results go through SimpleVideoTagger's probe cache.
+        """
+        def probe(path: Path) -> Dict[str, Any]:
+            try:
+                return SimpleVideoTagger(str(path)).get_video_info()
+            except Exception:
+                return {}
         
-        return results
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            infos = pool.map(probe, paths)
+            return {path: info for path, info in zip(paths, infos) if info}
     
-    def show_directory_status(self):
-        """Show the current status of all directories."""
-        print(f"\n{'='*60}")
-        print(f"DIRECTORY STATUS")
-        print(f"{'='*60}")
+    def show_directory_status(self, with_durations: bool = False):
+        """Show the current status of all directories.
+        
+        With ``with_durations`` every input video is probed (one ffprobe run each)
+        to show its length and the total.
+        """
+        lines = [f"\n{_SEP60}\n", "DIRECTORY STATUS\n", f"{_SEP60}\n"]
         
         # Input directory
         input_videos = self.get_video_files()
-        print(f"📁 Input directory ({self.input_dir}): {len(input_videos)} video(s)")
+        infos = self.probe_all(input_videos) if with_durations else {}
+        durations = {path: float(info.get('format', {}).get('duration', 0)) for path, info in infos.items()}
+        lines.append(f"📁 Input directory ({self.input_dir}): {len(input_videos)} video(s)")
+        if durations:
+            lines.append(f", {_format_duration(sum(durations.values()))} total")
+        lines.append("\n")
         for video in input_videos:
-            print(f"   - {video.name}")
+            if video in durations:
+                lines.append(f"   - {video.name} ({_format_duration(durations[video])})\n")
+            else:
+                lines.append(f"   - {video.name}\n")
         
         # Processed directory
-        processed_files = list(self.processed_dir.glob("*.mp4")) + list(self.processed_dir.glob("*.avi")) + list(self.processed_dir.glob("*.mov"))
-        print(f"\n📁 Processed directory ({self.processed_dir}): {len(processed_files)} file(s)")
-        for file in processed_files[:5]:  # Show first 5
-            print(f"   - {file.name}")
-        if len(processed_files) > 5:
-            print(f"   ... and {len(processed_files) - 5} more")
+        processed_files, processed_count = self._list_files(
+            self.processed_dir, _VIDEO_RE.search, limit=5)
+        lines.append(f"\n📁 Processed directory ({self.processed_dir}): {processed_count} file(s)\n")
+        lines.extend(f"   - {name}\n" for name in processed_files)  # Show first 5
+        if processed_count > 5:
+            lines.append(f"   ... and {processed_count - 5} more\n")
         
         # Output directory
-        output_files = list(self.output_dir.glob("*_tagged.*"))
-        print(f"\n📁 Output directory ({self.output_dir}): {len(output_files)} tagged file(s)")
-        for file in output_files[:5]:  # Show first 5
-            print(f"   - {file.name}")
-        if len(output_files) > 5:
-            print(f"   ... and {len(output_files) - 5} more")
+        output_files, output_count = self._list_files(
+            self.output_dir, lambda name: '_tagged.' in name, limit=5)
+        lines.append(f"\n📁 Output directory ({self.output_dir}): {output_count} tagged file(s)\n")
+        lines.extend(f"   - {name}\n" for name in output_files)  # Show first 5
+        if output_count > 5:
+            lines.append(f"   ... and {output_count - 5} more\n")
+        
+        sys.stdout.write("".join(lines))
+    
+    @staticmethod
+    def _list_files(path: Path, match: Callable[[str], Any],
+                    limit: Optional[int] = None) -> Tuple[List[str], int]:
+        """Scan a directory once, returning up to ``limit`` matching file names and the total match count."""
+        names = []
+        count = 0
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if match(entry.name) and entry.is_file(follow_symlinks=False):
+                    count += 1
+                    if limit is None or len(names) < limit:
+                        names.append(entry.name)
+        return names, count
 
 
 def main():
@@ -170,8 +492,11 @@ def main():
 Examples:
   python batch_video_tagger.py --process-all
   python batch_video_tagger.py --status
+  python batch_video_tagger.py --status --durations
   python batch_video_tagger.py --metadata custom_metadata.json
   python batch_video_tagger.py --input videos --output tagged --processed done
+  python batch_video_tagger.py --process-all --workers 4
+  python batch_video_tagger.py --process-all --asyncio
         """
     )
     
@@ -179,6 +504,8 @@ Examples:
                        help='Process all videos in input directory')
     parser.add_argument('--status', action='store_true', 
                        help='Show directory status')
+    parser.add_argument('--durations', action='store_true',
+                       help='With the status view, probe input videos to show their durations')
     parser.add_argument('--metadata', metavar='JSON_FILE', default='sample_metadata.json',
                        help='Metadata JSON file (default: sample_metadata.json)')
     parser.add_argument('--input', metavar='INPUT_DIR', default='input',
@@ -187,19 +514,27 @@ Examples:
                        help='Output directory (default: output)')
     parser.add_argument('--processed', metavar='PROCESSED_DIR', default='processed',
                        help='Processed directory (default: processed)')
+    parser.add_argument('--workers', '-j', metavar='N', type=int, default=None,
+                       help='Number of videos to process in parallel (default: number of CPUs)')
+    parser.add_argument('--asyncio', action='store_true',
+                       help='Drive the ffmpeg processes from one thread with asyncio instead of a process pool')
+    parser.add_argument('--quiet', '-q', action='store_true',
+                       help='Only report errors and the final summary')
     
     args = parser.parse_args()
     
     try:
-        tagger = BatchVideoTagger(args.input, args.processed, args.output)
+        tagger = BatchVideoTagger(args.input, args.processed, args.output, args.quiet)
         
         if args.status:
-            tagger.show_directory_status()
+            tagger.show_directory_status(args.durations)
+        elif args.process_all and args.asyncio:
+            asyncio.run(tagger.process_all_videos_async(args.metadata, args.workers))
         elif args.process_all:
-            tagger.process_all_videos(args.metadata)
+            tagger.process_all_videos(args.metadata, args.workers)
         else:
             # Default: show status
-            tagger.show_directory_status()
+            tagger.show_directory_status(args.durations)
             print(f"\nUse --process-all to start processing videos")
     
     except Exception as e:
@@ -8,8 +8,12 @@ import os
 import sys
 import json
 import argparse
+import shutil
+import subprocess
+import tempfile
+import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional, Tuple
 
 try:
     import ffmpeg
@@ -17,19 +21,90 @@ except ImportError:
     print("Error: ffmpeg-python not installed. Please run: pip install ffmpeg-python")
     sys.exit(1)
 
+try:
+    # Optional: faster parsing of metadata JSON files
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+try:
+    # Optional: lets MP4/MOV tags be patched without rewriting the file
+    from mutagen.mp4 import MP4, MP4FreeForm
+except ImportError:
+    MP4 = None
+
+MP4_SUFFIXES = {'.mp4', '.m4v', '.mov'}
+MATROSKA_SUFFIXES = {'.mkv', '.webm'}
+
+# ffmpeg tag names and the iTunes-style atoms ffmpeg uses for them in MP4.
+# Any other key is stored as a freeform "----" atom, which ffprobe reads back
+# under the same name.
+MP4_ATOMS = {
+    'title': '\xa9nam',
+    'artist': '\xa9ART',
+    'album_artist': 'aART',
+    'album': '\xa9alb',
+    'year': '\xa9day',
+    'date': '\xa9day',
+    'genre': '\xa9gen',
+    'comment': '\xa9cmt',
+    'composer': '\xa9wrt',
+    'description': 'desc',
+    'copyright': 'cprt',
+}
+
+
+def _run_ffmpeg(cmd: list) -> subprocess.CompletedProcess:
+    """Run an ffmpeg command quietly, capturing only its error messages.
+    
+    "-nostats -loglevel error" leaves ffmpeg nothing to print on success, so
+    the captured stderr stays tiny and holds just the error of a failed run.
+    """
+    cmd = [cmd[0], '-nostats', '-loglevel', 'error', *cmd[1:]]
+    return subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
 
 class SimpleVideoTagger:
     """A simple class to handle video metadata tagging operations."""
     
-    def __init__(self, video_path: str):
-        self.video_path = Path(video_path)
-        if not self.video_path.exists():
+    # ffprobe results shared by all instances: path -> ((mtime_ns, size), probe)
+    _probe_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+    
+    def __init__(self, video_path: Optional[str] = None):
+        self.video_path = None
+        if video_path is not None:
+            self.bind(video_path)
+    
+    def bind(self, video_path: str) -> 'SimpleVideoTagger':
+        """Point this tagger at another video file, so one instance can be reused."""
+        path = Path(video_path)
+        if not path.exists():
             raise FileNotFoundError(f"Video file not found: {video_path}")
+        self.video_path = path
+        return self
+    
+    def _probe(self) -> Dict[str, Any]:
+        """Run ffprobe on the video, reusing the last result while the file is unchanged."""
+        path = str(self.video_path)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._probe_cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        probe = ffmpeg.probe(path)
+        self._probe_cache[path] = (stamp, probe)
+        return probe
+    
+    @classmethod
+    def _invalidate_probe(cls, path: str):
+        """Forget the cached probe for a file that has just been rewritten."""
+        cls._probe_cache.pop(str(path), None)
     
     def get_video_info(self) -> Dict[str, Any]:
         """Get basic video information using ffprobe."""
         try:
-            probe = ffmpeg.probe(str(self.video_path))
+            probe = self._probe()
             return probe
         except ffmpeg.Error as e:
             print(f"Error reading video info: {e}")
@@ -38,7 +113,7 @@ class SimpleVideoTagger:
     def read_metadata(self) -> Dict[str, Any]:
         """Read existing metadata from the video file."""
         try:
-            probe = ffmpeg.probe(str(self.video_path))
+            probe = self._probe()
             metadata = {}
             
             # Extract metadata from format info
@@ -55,50 +130,187 @@ class SimpleVideoTagger:
             print(f"Error reading metadata: {e}")
             return {}
     
-    def write_metadata(self, metadata: Dict[str, str], output_path: Optional[str] = None) -> bool:
-        """Write metadata to the video file using ffmpeg CLI for better MP4 support."""
+    def build_write_command(self, metadata: Dict[str, str], output_path: str) -> list:
+        """Build the ffmpeg command line used by write_metadata."""
+        # Paths are passed as bytes so subprocess does not re-encode them
+        cmd = [
+            'ffmpeg',
+            '-i', os.fsencode(self.video_path),
+            '-y',  # Overwrite output
+            '-codec', 'copy'
+        ]
+        for k, v in metadata.items():
+            cmd += ['-metadata', f'{k}={v}']
+        cmd.append(os.fsencode(output_path))
+        return cmd
+    
+    def write_metadata(self, metadata: Dict[str, str], output_path: Optional[str] = None,
+                       quiet: bool = False) -> bool:
+        """Write metadata to the video file using ffmpeg CLI for better MP4 support.
+        
+        With ``quiet`` only errors are reported.
+        """
         if output_path is None:
             output_path = str(self.video_path)
         
         try:
-            # Build ffmpeg command
+            cmd = self.build_write_command(metadata, output_path)
+            result = _run_ffmpeg(cmd)
+            if result.returncode != 0:
+                print(f"ffmpeg error: {result.stderr}")
+                return False
+            self._invalidate_probe(output_path)
+            if not quiet:
+                print(f"✓ Metadata written successfully to: {output_path}")
+            return True
+        except Exception as e:
+            print(f"Error writing metadata: {e}")
+            return False
+    
+    def apply_tags(self, add: Dict[str, str], remove: Iterable[str] = (), output_path: Optional[str] = None) -> Optional[bool]:
+        """Add and remove tags in one ffmpeg run, keeping all other existing tags.
+        
+        Returns None without writing anything when no tag would change.
+        """
+        if output_path is None:
+            output_path = str(self.video_path)
+        
+        # Only drop tags the file actually has; the probe is cached, so this is free
+        current_metadata = self.read_metadata()
+        present = []
+        for key in remove:
+            if key in current_metadata:
+                present.append(key)
+            else:
+                print(f"Tag '{key}' not found in metadata")
+        remove = present
+        if not add and not remove:
+            return None  # Nothing would change, so skip the rewrite
+        
+        try:
             cmd = [
                 'ffmpeg',
-                '-i', str(self.video_path),
+                '-i', os.fsencode(self.video_path),
                 '-y',  # Overwrite output
+                '-map', '0',
+                '-map_metadata', '0',  # Keep the tags we are not touching
                 '-codec', 'copy'
             ]
-            for k, v in metadata.items():
+            for k, v in add.items():
                 cmd += ['-metadata', f'{k}={v}']
-            cmd.append(output_path)
+            for k in remove:
+                cmd += ['-metadata', f'{k}=']  # An empty value drops the tag
+            cmd.append(os.fsencode(output_path))
             
-            import subprocess
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = _run_ffmpeg(cmd)
             if result.returncode != 0:
                 print(f"ffmpeg error: {result.stderr}")
                 return False
-            print(f"✓ Metadata written successfully to: {output_path}")
+            self._invalidate_probe(output_path)
+            print(f"✓ Tags updated in: {output_path}")
             return True
         except Exception as e:
-            print(f"Error writing metadata: {e}")
+            print(f"Error updating tags: {e}")
             return False
     
     def add_single_tag(self, key: str, value: str, output_path: Optional[str] = None) -> bool:
         """Add a single metadata tag."""
-        current_metadata = self.read_metadata()
-        current_metadata[key] = value
-        return self.write_metadata(current_metadata, output_path)
+        return self.apply_tags({key: value}, (), output_path)
     
-    def remove_tag(self, key: str, output_path: Optional[str] = None) -> bool:
-        """Remove a specific metadata tag."""
-        current_metadata = self.read_metadata()
-        if key in current_metadata:
-            del current_metadata[key]
-            return self.write_metadata(current_metadata, output_path)
-        else:
-            print(f"Tag '{key}' not found in metadata")
+    def remove_tag(self, key: str, output_path: Optional[str] = None) -> Optional[bool]:
+        """Remove a specific metadata tag; None if the file does not have it."""
+        return self.apply_tags({}, (key,), output_path)
+    
+    def can_write_inplace(self) -> bool:
+        """Check whether the tags of this file can be patched without rewriting it."""
+        suffix = self.video_path.suffix.lower()
+        if suffix in MP4_SUFFIXES:
+            return MP4 is not None
+        if suffix in MATROSKA_SUFFIXES:
+            return shutil.which('mkvpropedit') is not None
+        return False
+    
+    def write_metadata_inplace(self, metadata: Dict[str, str], quiet: bool = False) -> bool:
+        """Write metadata into the video file itself, touching only the tag data.
+        
+        MP4/MOV files are patched with mutagen and Matroska/WebM files with
+        mkvpropedit. Other containers, a missing tool or a failed patch fall
+        back to an ffmpeg stream copy into a temporary file that replaces the
+        original. With ``quiet`` only errors are reported.
+        """
+        path = str(self.video_path)
+        try:
+            if self.can_write_inplace():
+                try:
+                    if self.video_path.suffix.lower() in MP4_SUFFIXES:
+                        self._write_mp4_tags(metadata)
+                    else:
+                        self._write_matroska_tags(metadata)
+                    patched = True
+                except Exception as e:
+                    print(f"Could not patch tags in place ({e}), rewriting with ffmpeg")
+                    patched = False
+            else:
+                patched = False
+            
+            if not patched:
+                temp_path = self.video_path.with_name(f".{self.video_path.stem}.tagging{self.video_path.suffix}")
+                if not self.write_metadata(metadata, str(temp_path), quiet=True):
+                    temp_path.unlink(missing_ok=True)
+                    return False
+                os.replace(temp_path, path)
+            
+            self._invalidate_probe(path)
+            if not quiet:
+                print(f"✓ Metadata written successfully to: {path}")
+            return True
+        except Exception as e:
+            print(f"Error writing metadata: {e}")
             return False
     
+    def _write_mp4_tags(self, metadata: Dict[str, str]):
+        """Set MP4 tags in place with mutagen."""
+        video = MP4(str(self.video_path))
+        if video.tags is None:
+            video.add_tags()
+        for key, value in metadata.items():
+            atom = MP4_ATOMS.get(key.lower())
+            if atom is not None:
+                video.tags[atom] = [str(value)]
+            else:
+                video.tags[f'----:com.apple.iTunes:{key}'] = [MP4FreeForm(str(value).encode('utf-8'))]
+        video.save()
+    
+    def _write_matroska_tags(self, metadata: Dict[str, str]):
+        """Set Matroska tags in place with mkvpropedit."""
+        # mkvpropedit replaces the whole set of global tags, so keep existing ones
+        existing = self._probe().get('format', {}).get('tags', {})
+        tags = {k.upper(): v for k, v in existing.items()
+                if k.lower() not in ('title', 'encoder', 'creation_time')}
+        tags.update((k.upper(), str(v)) for k, v in metadata.items() if k.lower() != 'title')
+        
+        root = ET.Element('Tags')
+        tag = ET.SubElement(root, 'Tag')
+        ET.SubElement(tag, 'Targets')
+        for name, value in tags.items():
+            simple = ET.SubElement(tag, 'Simple')
+            ET.SubElement(simple, 'Name').text = name
+            ET.SubElement(simple, 'String').text = value
+        
+        with tempfile.NamedTemporaryFile('wb', suffix='.xml', delete=False) as f:
+            ET.ElementTree(root).write(f, encoding='utf-8', xml_declaration=True)
+            tags_file = f.name
+        try:
+            cmd = ['mkvpropedit', str(self.video_path), '--tags', f'global:{tags_file}']
+            if 'title' in metadata:
+                # The title lives in the segment info rather than in the tags
+                cmd += ['--edit', 'info', '--set', f"title={metadata['title']}"]
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"mkvpropedit error: {result.stdout or result.stderr}")
+        finally:
+            os.unlink(tags_file)
+    
     def clear_all_metadata(self, output_path: Optional[str] = None) -> bool:
         """Clear all metadata from the video file."""
         try:
@@ -110,7 +322,11 @@ class SimpleVideoTagger:
                 codec='copy'
             )
             
-            ffmpeg.run(output_stream, overwrite_output=True, quiet=True)
+            result = _run_ffmpeg(ffmpeg.compile(output_stream, overwrite_output=True))
+            if result.returncode != 0:
+                print(f"Error clearing metadata: {result.stderr}")
+                return False
+            self._invalidate_probe(output_path or str(self.video_path))
             print(f"✓ All metadata cleared from: {output_path or str(self.video_path)}")
             return True
             
@@ -181,7 +397,8 @@ Examples:
     parser.add_argument('--read', action='store_true', help='Read and display metadata')
     parser.add_argument('--add', nargs=2, metavar=('KEY', 'VALUE'), action='append', 
                        help='Add a metadata tag (can be used multiple times)')
-    parser.add_argument('--remove', metavar='KEY', help='Remove a specific metadata tag')
+    parser.add_argument('--remove', metavar='KEY', action='append',
+                       help='Remove a specific metadata tag (can be used multiple times)')
     parser.add_argument('--clear', action='store_true', help='Clear all metadata')
     parser.add_argument('--batch', metavar='JSON_FILE', help='Load metadata from JSON file')
     parser.add_argument('--output', '-o', metavar='OUTPUT_FILE', help='Output file path')
@@ -209,18 +426,17 @@ Examples:
         if args.read:
             tagger.display_metadata()
         
-        # Add metadata tags
-        if args.add:
-            for key, value in args.add:
+        # Add and remove metadata tags in a single pass
+        if args.add or args.remove:
+            add_tags = dict(args.add or [])
+            remove_tags = args.remove or []
+            for key, value in add_tags.items():
                 print(f"Adding tag: {key} = {value}")
-                success = tagger.add_single_tag(key, value, args.output)
-                if not success:
-                    print(f"Failed to add tag: {key}")
-        
-        # Remove metadata tag
-        if args.remove:
-            print(f"Removing tag: {args.remove}")
-            tagger.remove_tag(args.remove, args.output)
+            for key in remove_tags:
+                print(f"Removing tag: {key}")
+            success = tagger.apply_tags(add_tags, remove_tags, args.output)
+            if success is False:  # None: nothing to change, already warned about
+                print("Failed to update tags")
         
         # Clear all metadata
         if args.clear:
@@ -230,8 +446,7 @@ Examples:
         # Batch load from JSON
         if args.batch:
             try:
-                with open(args.batch, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
+                metadata = json_loads(Path(args.batch).read_bytes())
                 
                 print(f"Loading metadata from: {args.batch}")
                 # Apply auto-title loading
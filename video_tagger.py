@@ -10,7 +10,7 @@ import sys
 import json
 import argparse
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional, Tuple
 import subprocess
 from datetime import datetime
 
@@ -20,6 +20,21 @@ except ImportError:
     print("Error: ffmpeg-python not installed. Please run: pip install ffmpeg-python")
     sys.exit(1)
 
+try:
+    # Optional: faster metadata JSON parsing and serialisation
+    import orjson
+    json_loads = orjson.loads
+    
+    def json_dumps(obj: Any) -> bytes:
+        """Serialise to indented UTF-8 JSON."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    json_loads = json.loads
+    
+    def json_dumps(obj: Any) -> bytes:
+        """Serialise to indented UTF-8 JSON."""
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
 try:
     from colorama import init, Fore, Style
     init(autoreset=True)
@@ -36,18 +51,64 @@ except ImportError:
         RESET_ALL = ""
 
 
+def _metadata_kwargs(add: Dict[str, str], remove: Iterable[str] = ()) -> Dict[str, str]:
+    """Build ffmpeg.output() kwargs that set or drop every tag in one output node.
+    
+    Each tag gets its own "-metadata:g:N" option; an empty value ("key=")
+    tells ffmpeg to drop the tag. ffmpeg-python sorts kwargs as strings, so
+    N is zero-padded to keep the options (and which edit wins) in order;
+    ffmpeg ignores everything after the "g".
+    """
+    kwargs = {f'metadata:g:{i:04d}': f"{key}={value}" for i, (key, value) in enumerate(add.items())}
+    kwargs.update((f'metadata:g:{i:04d}', f"{key}=") for i, key in enumerate(remove, len(add)))
+    return kwargs
+
+
+def _run_ffmpeg(output_stream):
+    """Run an ffmpeg-python output, raising ffmpeg.Error on failure like ffmpeg.run.
+    
+    "-nostats -loglevel error" leaves ffmpeg nothing to print on success, so
+    only the error of a failed run ends up in the captured stderr.
+    """
+    cmd = ffmpeg.compile(output_stream, overwrite_output=True)
+    cmd[1:1] = ['-nostats', '-loglevel', 'error']
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise ffmpeg.Error('ffmpeg', None, result.stderr)
+
+
 class VideoTagger:
     """A class to handle video metadata tagging operations."""
     
+    # ffprobe results shared by all instances: path -> ((mtime_ns, size), probe)
+    _probe_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+    
     def __init__(self, video_path: str):
         self.video_path = Path(video_path)
         if not self.video_path.exists():
             raise FileNotFoundError(f"Video file not found: {video_path}")
     
+    def _probe(self) -> Dict[str, Any]:
+        """Run ffprobe on the video, reusing the last result while the file is unchanged."""
+        path = str(self.video_path)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._probe_cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        probe = ffmpeg.probe(path)
+        self._probe_cache[path] = (stamp, probe)
+        return probe
+    
+    @classmethod
+    def _invalidate_probe(cls, path: str):
+        """Forget the cached probe for a file that has just been rewritten."""
+        cls._probe_cache.pop(str(path), None)
+    
     def get_video_info(self) -> Dict[str, Any]:
         """Get basic video information using ffprobe."""
         try:
-            probe = ffmpeg.probe(str(self.video_path))
+            probe = self._probe()
             return probe
         except ffmpeg.Error as e:
             print(f"{Fore.RED}Error reading video info: {e}")
@@ -56,7 +117,7 @@ class VideoTagger:
     def read_metadata(self) -> Dict[str, Any]:
         """Read existing metadata from the video file."""
         try:
-            probe = ffmpeg.probe(str(self.video_path))
+            probe = self._probe()
             metadata = {}
             
             # Extract metadata from format info
@@ -82,43 +143,77 @@ class VideoTagger:
             # Build ffmpeg command with metadata
             input_stream = ffmpeg.input(str(self.video_path))
             
-            # Add metadata to the output
-            output_stream = input_stream
-            
-            # Add format metadata
-            for key, value in metadata.items():
-                output_stream = ffmpeg.output(
-                    output_stream,
-                    output_path,
-                    metadata=f"{key}={value}",
-                    codec='copy'  # Copy streams without re-encoding
-                )
+            output_stream = ffmpeg.output(
+                input_stream,
+                output_path,
+                c='copy',  # Copy streams without re-encoding
+                map=0,
+                **_metadata_kwargs(metadata)
+            )
             
             # Run the ffmpeg command
-            ffmpeg.run(output_stream, overwrite_output=True, quiet=True)
+            _run_ffmpeg(output_stream)
             
+            self._invalidate_probe(output_path)
             print(f"{Fore.GREEN}✓ Metadata written successfully to: {output_path}")
             return True
             
         except ffmpeg.Error as e:
-            print(f"{Fore.RED}Error writing metadata: {e}")
+            print(f"{Fore.RED}Error writing metadata: {e.stderr.decode(errors='replace')}")
+            return False
+    
+    def apply_tags(self, add: Dict[str, str], remove: Iterable[str] = (), output_path: Optional[str] = None,
+                   clear: bool = False) -> Optional[bool]:
+        """Add and remove tags in one ffmpeg run, keeping all other existing tags.
+        
+        With ``clear`` the existing tags are dropped first, so only ``add`` is written.
+        Returns None without writing anything when no tag would change.
+        """
+        if output_path is None:
+            output_path = str(self.video_path)
+        
+        if not clear:
+            # Only drop tags the file actually has; the probe is cached, so this is free
+            current_metadata = self.read_metadata()
+            present = []
+            for key in remove:
+                if key in current_metadata:
+                    present.append(key)
+                else:
+                    print(f"{Fore.YELLOW}Tag '{key}' not found in metadata")
+            remove = present
+            if not add and not remove:
+                return None  # Nothing would change, so skip the rewrite
+        
+        try:
+            input_stream = ffmpeg.input(str(self.video_path))
+            
+            output_stream = ffmpeg.output(
+                input_stream,
+                output_path,
+                c='copy',
+                map=0,
+                map_metadata='-1' if clear else 0,  # Keep the tags we are not touching
+                **_metadata_kwargs(add, remove)
+            )
+            
+            _run_ffmpeg(output_stream)
+            
+            self._invalidate_probe(output_path)
+            print(f"{Fore.GREEN}✓ Tags updated in: {output_path}")
+            return True
+            
+        except ffmpeg.Error as e:
+            print(f"{Fore.RED}Error updating tags: {e.stderr.decode(errors='replace')}")
             return False
     
     def add_single_tag(self, key: str, value: str, output_path: Optional[str] = None) -> bool:
         """Add a single metadata tag."""
-        current_metadata = self.read_metadata()
-        current_metadata[key] = value
-        return self.write_metadata(current_metadata, output_path)
-    
-    def remove_tag(self, key: str, output_path: Optional[str] = None) -> bool:
-        """Remove a specific metadata tag."""
-        current_metadata = self.read_metadata()
-        if key in current_metadata:
-            del current_metadata[key]
-            return self.write_metadata(current_metadata, output_path)
-        else:
-            print(f"{Fore.YELLOW}Tag '{key}' not found in metadata")
-            return False
+        return self.apply_tags({key: value}, (), output_path)
+    
+    def remove_tag(self, key: str, output_path: Optional[str] = None) -> Optional[bool]:
+        """Remove a specific metadata tag; None if the file does not have it."""
+        return self.apply_tags({}, (key,), output_path)
     
     def clear_all_metadata(self, output_path: Optional[str] = None) -> bool:
         """Clear all metadata from the video file."""
@@ -131,12 +226,13 @@ class VideoTagger:
                 codec='copy'
             )
             
-            ffmpeg.run(output_stream, overwrite_output=True, quiet=True)
+            _run_ffmpeg(output_stream)
+            self._invalidate_probe(output_path or str(self.video_path))
             print(f"{Fore.GREEN}✓ All metadata cleared from: {output_path or str(self.video_path)}")
             return True
             
         except ffmpeg.Error as e:
-            print(f"{Fore.RED}Error clearing metadata: {e}")
+            print(f"{Fore.RED}Error clearing metadata: {e.stderr.decode(errors='replace')}")
             return False
     
     def display_metadata(self):
@@ -175,7 +271,8 @@ Examples:
     parser.add_argument('--read', action='store_true', help='Read and display metadata')
     parser.add_argument('--add', nargs=2, metavar=('KEY', 'VALUE'), action='append', 
                        help='Add a metadata tag (can be used multiple times)')
-    parser.add_argument('--remove', metavar='KEY', help='Remove a specific metadata tag')
+    parser.add_argument('--remove', metavar='KEY', action='append',
+                       help='Remove a specific metadata tag (can be used multiple times)')
     parser.add_argument('--clear', action='store_true', help='Clear all metadata')
     parser.add_argument('--batch', metavar='JSON_FILE', help='Load metadata from JSON file')
     parser.add_argument('--output', '-o', metavar='OUTPUT_FILE', help='Output file path')
@@ -203,42 +300,41 @@ Examples:
         if args.read:
             tagger.display_metadata()
         
-        # Add metadata tags
-        if args.add:
-            for key, value in args.add:
-                print(f"{Fore.BLUE}Adding tag: {key} = {value}")
-                success = tagger.add_single_tag(key, value, args.output)
-                if not success:
-                    print(f"{Fore.RED}Failed to add tag: {key}")
-        
-        # Remove metadata tag
-        if args.remove:
-            print(f"{Fore.BLUE}Removing tag: {args.remove}")
-            tagger.remove_tag(args.remove, args.output)
-        
-        # Clear all metadata
-        if args.clear:
-            print(f"{Fore.BLUE}Clearing all metadata...")
-            tagger.clear_all_metadata(args.output)
-        
-        # Batch load from JSON
+        # Collect every requested change and write them with a single ffmpeg run:
+        # clear first, then the batch file, then --add, then --remove
+        add_tags = {}
         if args.batch:
             try:
-                with open(args.batch, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                
+                add_tags.update(json_loads(Path(args.batch).read_bytes()))
                 print(f"{Fore.BLUE}Loading metadata from: {args.batch}")
-                success = tagger.write_metadata(metadata, args.output)
-                if success:
-                    print(f"{Fore.GREEN}✓ Batch metadata applied successfully")
-                else:
-                    print(f"{Fore.RED}Failed to apply batch metadata")
-                    
             except FileNotFoundError:
                 print(f"{Fore.RED}JSON file not found: {args.batch}")
             except json.JSONDecodeError:
                 print(f"{Fore.RED}Invalid JSON format in: {args.batch}")
         
+        for key, value in args.add or []:
+            print(f"{Fore.BLUE}Adding tag: {key} = {value}")
+            add_tags[key] = value
+        
+        remove_tags = []
+        for key in args.remove or []:
+            print(f"{Fore.BLUE}Removing tag: {key}")
+            # A key that only came from --batch/--add is simply not written; the file
+            # is asked to drop it only if it has it (no "not found" warning otherwise)
+            if key not in add_tags or key in tagger.read_metadata():
+                remove_tags.append(key)
+            add_tags.pop(key, None)
+        
+        if args.clear:
+            print(f"{Fore.BLUE}Clearing all metadata...")
+        
+        if args.clear or add_tags or remove_tags:
+            success = tagger.apply_tags(add_tags, remove_tags, args.output, clear=args.clear)
+            if success:
+                print(f"{Fore.GREEN}✓ All changes applied successfully")
+            elif success is not None:  # None: nothing to change, already warned about
+                print(f"{Fore.RED}Failed to apply changes")
+        
         # If no specific action was requested, show metadata
         if not any([args.read, args.add, args.remove, args.clear, args.batch, args.info]):
             tagger.display_metadata()
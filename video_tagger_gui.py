@@ -6,10 +6,31 @@ A simple GUI version of the video tagger for easier use.
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-import json
 import os
 from pathlib import Path
-from video_tagger import VideoTagger
+from video_tagger import VideoTagger, json_loads, json_dumps
+
+# (label, tag name) pairs for the metadata entry fields
+_COMMON_TAGS = (
+    ("Title:", "title"),
+    ("Artist:", "artist"),
+    ("Album:", "album"),
+    ("Year:", "year"),
+    ("Genre:", "genre"),
+    ("Language:", "language"),
+    ("Description:", "description"),
+    ("Keywords:", "keywords"),
+    ("Creator:", "creator"),
+    ("Copyright:", "copyright"),
+    ("Comment:", "comment"),
+    ("Rating:", "rating"),
+    ("Category:", "category"),
+)
+
+_VIDEO_FILETYPES = (
+    ("Video files", "*.mp4 *.avi *.mov *.mkv *.wmv *.flv *.webm"),
+    ("All files", "*.*"),
+)
 
 
 class VideoTaggerGUI:
@@ -54,24 +75,8 @@ class VideoTaggerGUI:
         metadata_frame.columnconfigure(1, weight=1)
         
         # Common tags
-        common_tags = [
-            ("Title:", "title"),
-            ("Artist:", "artist"),
-            ("Album:", "album"),
-            ("Year:", "year"),
-            ("Genre:", "genre"),
-            ("Language:", "language"),
-            ("Description:", "description"),
-            ("Keywords:", "keywords"),
-            ("Creator:", "creator"),
-            ("Copyright:", "copyright"),
-            ("Comment:", "comment"),
-            ("Rating:", "rating"),
-            ("Category:", "category")
-        ]
-        
         self.tag_vars = {}
-        for i, (label, tag) in enumerate(common_tags):
+        for i, (label, tag) in enumerate(_COMMON_TAGS):
             ttk.Label(metadata_frame, text=label).grid(row=i, column=0, sticky=tk.W, padx=(0, 5), pady=2)
             var = tk.StringVar()
             self.tag_vars[tag] = var
@@ -97,10 +102,7 @@ class VideoTaggerGUI:
     def browse_file(self):
         file_path = filedialog.askopenfilename(
             title="Select Video File",
-            filetypes=[
-                ("Video files", "*.mp4 *.avi *.mov *.mkv *.wmv *.flv *.webm"),
-                ("All files", "*.*")
-            ]
+            filetypes=_VIDEO_FILETYPES
         )
         if file_path:
             self.file_var.set(file_path)
@@ -216,8 +218,7 @@ class VideoTaggerGUI:
         
         if file_path:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
+                metadata = json_loads(Path(file_path).read_bytes())
                 
                 # Clear existing values
                 for var in self.tag_vars.values():
@@ -254,8 +255,7 @@ class VideoTaggerGUI:
         
         if file_path:
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(metadata, f, indent=4, ensure_ascii=False)
+                Path(file_path).write_bytes(json_dumps(metadata))
                 
                 self.status_var.set(f"Saved metadata to: {os.path.basename(file_path)}")
                 messagebox.showinfo("Success", f"Metadata saved to:\n{file_path}")
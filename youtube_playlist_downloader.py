@@ -6,55 +6,358 @@ Downloads videos from a YouTube playlist using yt-dlp
 
 import os
 import sys
-import argparse
+import json
+import time
+import queue
+import threading
+import subprocess
+import hashlib
+import sqlite3
+from contextlib import closing
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-import yt_dlp
+# yt_dlp is imported inside the functions that use it: loading its extractors
+# takes a noticeable moment that --help and cached listings never need.
+# asyncio and the optional httpx/h2 (HTTP/2 metadata lookups) are likewise only
+# imported by --list, the one mode that uses them.
 
-def download_playlist(playlist_url, output_dir="input", quality="best", audio_only=False):
+OEMBED_URL = 'https://www.youtube.com/oembed'
+
+# Playlist listings are cached on disk for a day, so re-runs skip the network
+CACHE_TTL = 24 * 60 * 60
+
+# Entry fields kept for a listing, and how many entries are printed at a time
+LIST_FIELDS = ('id', 'url', 'title', 'channel', 'duration')
+LIST_BATCH = 50
+
+class _MetaCache:
+    """SQLite store of extract_info results, keyed by a hash of the request"""
+    
+    def __init__(self, path=None):
+        # None: resolved on first use under $XDG_CACHE_HOME (or ~/.cache)
+        self.path = Path(path) if path is not None else None
+    
+    def _connect(self):
+        if self.path is None:
+            cache_home = os.environ.get('XDG_CACHE_HOME')
+            # Path.home() raises RuntimeError when there is no home directory
+            self.path = Path(cache_home or Path.home() / '.cache') / 'ytpd' / 'meta.db'
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, ts INTEGER, json BLOB)')
+        return conn
+    
+    def get(self, key, ttl):
+        """Return the cached info for key if it is younger than ttl seconds, else None"""
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute('SELECT json FROM meta WHERE key=? AND ts>?',
+                                   (key, int(time.time()) - ttl)).fetchone()
+        except (sqlite3.Error, OSError, RuntimeError):
+            return None
+        return json.loads(row[0]) if row else None
+    
+    def put(self, key, info):
+        """Store info under key; a cache that cannot be written is silently skipped"""
+        try:
+            with closing(self._connect()) as conn:
+                with conn:
+                    conn.execute('INSERT OR REPLACE INTO meta VALUES (?, ?, ?)',
+                                 (key, int(time.time()), json.dumps(info)))
+        except (sqlite3.Error, OSError, RuntimeError):
+            pass
+
+_META_CACHE = _MetaCache()
+
+def _cache_key(url, ydl_opts):
+    """Cache key for a URL; listings in different extract_flat modes are kept apart"""
+    return hashlib.sha256(json.dumps([url, ydl_opts.get('extract_flat')]).encode('utf-8')).hexdigest()
+
+def _open_flat(playlist_url, use_cache=True):
+    """
+    Start a flat playlist listing without waiting for every page
+    
+    Returns:
+        tuple: (playlist_info, entries) where entries yields the playlist
+        entries as yt-dlp pages them in. A fresh listing is written to the
+        cache once it has been read to the end.
+    """
+    ydl_opts = {
+        'extract_flat': 'in_playlist',
+        'lazy_playlist': True,
+        'quiet': True,
+    }
+    key = _cache_key(playlist_url, ydl_opts)
+    if use_cache:
+        playlist_info = _META_CACHE.get(key, CACHE_TTL)
+        if playlist_info is not None:
+            return playlist_info, iter(playlist_info.get('entries') or ())
+    
+    import yt_dlp
+    
+    # process=False hands back the extractor's own (paged) entries generator
+    ydl = yt_dlp.YoutubeDL(ydl_opts)
+    try:
+        playlist_info = ydl.extract_info(playlist_url, download=False, process=False)
+        if playlist_info.get('_type') in ('url', 'url_transparent'):
+            # The URL points elsewhere (e.g. a watch URL with a list); let yt-dlp resolve it
+            playlist_info = ydl.sanitize_info(ydl.extract_info(playlist_url, download=False))
+    except BaseException:
+        ydl.close()
+        raise
+    if 'entries' not in playlist_info:
+        ydl.close()
+        return playlist_info, iter(())
+    
+    def entries():
+        listing = []
+        try:
+            for entry in playlist_info.get('entries') or ():
+                if entry:
+                    entry = {field: entry.get(field) for field in LIST_FIELDS}
+                listing.append(entry)
+                yield entry
+        finally:
+            ydl.close()
+        _META_CACHE.put(key, {
+            'title': playlist_info.get('title'),
+            'playlist_count': len(listing),
+            'entries': listing,
+        })
+    
+    return playlist_info, entries()
+
+def plan_playlist(playlist_url):
+    """
+    List the videos of a playlist without resolving each one
+    
+    Args:
+        playlist_url (str): URL of the YouTube playlist
+    
+    Returns:
+        iterator: (position, video_url) pairs in playlist order, yielded as the
+        listing is paged in. position is the playlist index zero-padded to the
+        width of the last index (None for a single video).
+    """
+    # Always list the playlist live so videos added since the last run are picked up;
+    # the download archive already keeps re-runs cheap. The fresh listing still
+    # refreshes the cache used by --list.
+    playlist_info, entries = _open_flat(playlist_url, use_cache=False)
+    
+    if 'entries' not in playlist_info:
+        # A single video rather than a playlist
+        return iter([(None, playlist_info.get('webpage_url', playlist_url))])
+    
+    # The last index sets the padding; without a count up front, read the whole listing
+    last_index = playlist_info.get('playlist_count')
+    if not last_index:
+        entries = list(entries)
+        last_index = len(entries)
+    width = len(str(last_index))
+    
+    return (
+        (f'{index:0{width}d}', entry['url'])
+        for index, entry in enumerate(entries, 1)
+        if entry and entry.get('url')
+    )
+
+class _ThreadClients:
+    """One YoutubeDL per worker thread, reused for every video that thread downloads"""
+    
+    def __init__(self, ydl_opts):
+        self.ydl_opts = ydl_opts
+        self._local = threading.local()
+        self._clients = []
+    
+    def get(self):
+        """Return the calling thread's YoutubeDL, building it on first use"""
+        ydl = getattr(self._local, 'ydl', None)
+        if ydl is None:
+            import yt_dlp
+            # YoutubeDL is not thread-safe, so it is never shared between threads. It also
+            # keeps and rewrites the params dict it is given (outtmpl is filled in place),
+            # so each one gets its own copy; not a deepcopy, the in-memory archive set is shared.
+            params = {**self.ydl_opts}
+            for key in ('outtmpl', 'paths'):
+                if key in params:
+                    params[key] = dict(params[key])
+            ydl = self._local.ydl = yt_dlp.YoutubeDL(params)
+            self._clients.append(ydl)
+        return ydl
+    
+    def close(self):
+        """Close every YoutubeDL handed out so far"""
+        for ydl in self._clients:
+            ydl.close()
+        self._clients.clear()
+
+def _download_one(video_url, position, clients, on_downloaded=None):
+    """
+    Download a single playlist video with the worker thread's YoutubeDL
+    
+    on_downloaded, if given, is called with the info dict of a finished download.
+    
+    Returns:
+        str: 'downloaded', 'skipped' (already recorded in the download
+        archive) or 'failed'
+    """
+    import yt_dlp
+    
+    # The planner's numbering fills %(playlist_position)s; yt-dlp never has to know the playlist
+    extra_info = {'playlist_position': position} if position is not None else {}
+    
+    try:
+        info = clients.get().extract_info(video_url, download=True, extra_info=extra_info)
+    except yt_dlp.utils.DownloadError:
+        return 'failed'
+    # With errors raised, a video found in the archive comes back as None when
+    # yt-dlp can tell its id from the URL, or else as info whose formats were
+    # never written out (no filepath in requested_downloads)
+    if info is None or not any(d.get('filepath') for d in info.get('requested_downloads') or ()):
+        return 'skipped'
+    if on_downloaded is not None:
+        on_downloaded(info)
+    return 'downloaded'
+
+def _read_archive(path):
+    """Load a download archive file into a set of "<extractor> <id>" lines"""
+    try:
+        with open(path, encoding='utf-8') as archive_file:
+            return {line.strip() for line in archive_file if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+def _pp_worker(pp_queue, failed, archive_path):
+    """
+    Convert downloaded audio to MP3 one file at a time, off the download threads
+    
+    Takes (path, archive_id) pairs until it gets None. A video is added to
+    the download archive only once its MP3 exists, so files that could not be
+    converted (appended to failed) are downloaded again on the next run.
+    """
+    while True:
+        item = pp_queue.get()
+        if item is None:
+            return
+        path, archive_id = item
+        source = Path(path)
+        if source.suffix.lower() == '.mp3':
+            _append_archive(archive_path, archive_id)
+            continue
+        
+        target = source.with_suffix('.mp3')
+        cmd = ['ffmpeg', '-y', '-loglevel', 'error', '-i', str(source),
+               '-vn', '-codec:a', 'libmp3lame', '-b:a', '192k', str(target)]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            error = result.stderr.strip() if result.returncode != 0 else None
+        except OSError as e:
+            error = str(e)
+        
+        if error is None:
+            source.unlink()
+            _append_archive(archive_path, archive_id)
+            print(f"♪ Converted: {target.name}")
+        else:
+            failed.append(path)
+            print(f"✗ Conversion failed: {source.name}: {error}")
+
+def _append_archive(archive_path, archive_id):
+    """Record a finished video in the download archive file"""
+    with open(archive_path, 'a', encoding='utf-8') as archive_file:
+        archive_file.write(archive_id + '\n')
+
+def _ensure_dir(path):
+    """Create path (and its parents) unless it already exists; one stat in the common case"""
+    try:
+        os.stat(path)
+    except FileNotFoundError:
+        os.makedirs(path, exist_ok=True)
+
+def download_playlist(playlist_url, output_dir="input", format_spec="best", audio_only=False, jobs=4):
     """
     Download videos from a YouTube playlist
     
     Args:
         playlist_url (str): URL of the YouTube playlist
         output_dir (str): Directory to save downloaded videos
-        quality (str): Video quality preference
+        format_spec (str): yt-dlp format selector for video downloads
         audio_only (bool): If True, download only audio
+        jobs (int): Number of videos to download at the same time
     """
     
-    # Create output directory if it doesn't exist
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    # Create output directory if it doesn't exist (once, before any worker starts)
+    _ensure_dir(output_dir)
     
-    # Configure yt-dlp options
+    # Configure yt-dlp options; the output root is resolved once and handed to
+    # yt-dlp's paths handling instead of being joined into the template
+    output_root = Path(output_dir).resolve()
+    # Archive lines only hold the video id, so audio-only runs keep their own
+    # archive: a video downloaded as video still gets its MP3 with -a, and vice versa
+    archive_path = output_root / ('.ytdlp-archive-audio.txt' if audio_only else '.ytdlp-archive.txt')
     ydl_opts = {
-        'outtmpl': os.path.join(output_dir, '%(playlist_index)s-%(title)s.%(ext)s'),
-        'ignoreerrors': True,  # Continue downloading even if some videos fail
+        'paths': {'home': str(output_root)},
+        'outtmpl': {'default': '%(playlist_position)s-%(title)s.%(ext)s'},
+        # Videos finished in an earlier run are skipped without asking YouTube again
+        'download_archive': str(archive_path),
+        'ignoreerrors': False,  # Failures are caught per video, the others keep downloading
         'no_warnings': False,
-        'extract_flat': False,
     }
     
     # Set quality preferences
+    pp_queue = on_downloaded = None
     if audio_only:
         ydl_opts['format'] = 'bestaudio[ext=m4a]/bestaudio[ext=mp3]/bestaudio'
-        ydl_opts['postprocessors'] = [{
-            'key': 'FFmpegExtractAudio',
-            'preferredcodec': 'mp3',
-            'preferredquality': '192',
-        }]
+        # Convert to MP3 in a separate worker so ffmpeg never holds up a download slot
+        pp_queue = queue.Queue()
+        ydl_opts['postprocessors'] = []
+        # Given a set instead of a path, yt-dlp checks and updates the archive in
+        # memory only; _pp_worker writes each line once the MP3 really exists
+        ydl_opts['download_archive'] = _read_archive(archive_path)
+        
+        def on_downloaded(info):
+            archive_id = f"{info['extractor_key'].lower()} {info['id']}"
+            for download in info.get('requested_downloads') or ():
+                pp_queue.put((download['filepath'], archive_id))
     else:
-        ydl_opts['format'] = f'best[height<={quality}]' if quality.isdigit() else quality
+        ydl_opts['format'] = format_spec
     
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            print(f"Starting download of playlist: {playlist_url}")
-            print(f"Output directory: {output_dir}")
-            print(f"Quality: {'Audio only' if audio_only else quality}")
-            print("-" * 50)
-            
-            # Download the playlist
-            ydl.download([playlist_url])
-            
-            print("-" * 50)
-            print("Download completed!")
+        print(f"Starting download of playlist: {playlist_url}")
+        print(f"Output directory: {output_dir}")
+        print(f"Quality: {'Audio only' if audio_only else format_spec}")
+        print(f"Parallel downloads: {jobs}")
+        print("-" * 50)
+        
+        # Only page through the flat listing here; videos are handed to the workers
+        # as soon as they are listed and each worker resolves its own video
+        videos = plan_playlist(playlist_url)
+        
+        failed = []
+        skipped = []
+        failed_conversions = []
+        if pp_queue is not None:
+            pp_thread = threading.Thread(target=_pp_worker, args=(pp_queue, failed_conversions, archive_path))
+            pp_thread.start()
+        
+        try:
+            total = _run_downloads(videos, ydl_opts, jobs, failed, skipped, on_downloaded)
+        finally:
+            if pp_queue is not None:
+                pp_queue.put(None)
+                pp_thread.join()
+        
+        print("-" * 50)
+        downloaded = total - len(failed) - len(skipped)
+        print(f"Download completed! {downloaded} of {total} video(s) downloaded")
+        if skipped:
+            print(f"{len(skipped)} video(s) were already downloaded")
+        for position, url in sorted(failed, key=lambda item: item[0] or ''):
+            print(f"  Failed #{position}: {url}" if position is not None else f"  Failed: {url}")
+        if failed_conversions:
+            print(f"{len(failed_conversions)} file(s) could not be converted to MP3; "
+                  "they will be downloaded again on the next run")
             
     except Exception as e:
         print(f"Error downloading playlist: {e}")
@@ -62,48 +365,181 @@ def download_playlist(playlist_url, output_dir="input", quality="best", audio_on
     
     return True
 
-def list_playlist_videos(playlist_url):
+def _run_downloads(videos, ydl_opts, jobs, failed, skipped, on_downloaded=None):
+    """
+    Download (position, url) pairs on a thread pool, collecting failed and skipped ones
+    
+    Returns:
+        int: Number of videos that were attempted
+    """
+    clients = _ThreadClients(ydl_opts)
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            try:
+                futures = {
+                    pool.submit(_download_one, url, position, clients, on_downloaded): (position, url)
+                    for position, url in videos
+                }
+                for future in as_completed(futures):
+                    position, url = futures[future]
+                    try:
+                        status = future.result()
+                    except Exception as e:
+                        print(f"Error downloading {url}: {e}")
+                        status = 'failed'
+                    if status == 'downloaded':
+                        print(f"✓ Finished: {url}")
+                    elif status == 'skipped':
+                        skipped.append((position, url))
+                        print(f"- Already downloaded: {url}")
+                    else:
+                        failed.append((position, url))
+                        print(f"✗ Failed: {url}")
+            except BaseException:
+                # On Ctrl-C (or any error) drop the queued videos instead of letting the
+                # pool's shutdown run every one of them; only in-flight downloads finish
+                pool.shutdown(cancel_futures=True)
+                raise
+    finally:
+        # The pool has shut down, so no thread is still using its YoutubeDL
+        clients.close()
+    return len(futures)
+
+async def _fetch_entry(client, video_id):
+    """Fetch a video's oEmbed record (title, channel); returns {} on any failure."""
+    import httpx
+    
+    params = {'url': f'https://www.youtube.com/watch?v={video_id}', 'format': 'json'}
+    try:
+        response = await client.get(OEMBED_URL, params=params)
+        if response.status_code != 200:
+            return {}
+        return response.json()
+    except (httpx.HTTPError, ValueError):
+        return {}
+
+async def _fill_missing(client, entries):
+    """Look up titles/channels missing from a batch of entries concurrently"""
+    import asyncio
+    
+    missing = [e for e in entries if e.get('id') and not (e.get('title') and e.get('channel'))]
+    if missing:
+        details = await asyncio.gather(*[_fetch_entry(client, e['id']) for e in missing])
+        for entry, detail in zip(missing, details):
+            entry['title'] = entry.get('title') or detail.get('title')
+            entry['channel'] = entry.get('channel') or detail.get('author_name')
+
+def _format_entries(numbered):
+    """Listing lines for a batch of (playlist index, entry) pairs"""
+    lines = []
+    for i, entry in numbered:
+        duration = entry.get('duration')
+        lines.append(f"{i:2d}. {entry.get('title') or 'Unknown title'}")
+        if entry.get('channel'):
+            lines.append(f"    Channel: {entry['channel']}")
+        if duration is not None:
+            minutes, seconds = divmod(int(duration), 60)
+            lines.append(f"    Duration: {minutes}:{seconds:02d}")
+        lines.append("")
+    return lines
+
+async def _list_async(playlist_url, use_cache=True):
+    """
+    Print a playlist listing as it is paged in
+    
+    yt-dlp runs in a worker thread so it does not block the event loop. Each
+    batch of entries is printed once its missing titles/channels have been
+    looked up; the oEmbed lookups are multiplexed over one HTTP/2 connection.
+    """
+    import asyncio
+    
+    try:
+        # Optional: concurrent metadata lookups over HTTP/2
+        import httpx
+        import h2  # noqa: F401  (needed for httpx's http2=True)
+    except ImportError:
+        httpx = None
+    
+    loop = asyncio.get_running_loop()
+    playlist_info, entries = await loop.run_in_executor(None, _open_flat, playlist_url, use_cache)
+    
+    if 'entries' not in playlist_info:
+        print("No videos found in playlist or playlist is private.")
+        return
+    
+    print(f"Playlist: {playlist_info.get('title', 'Unknown')}")
+    print("-" * 50)
+    
+    client = None
+    if httpx is not None:
+        limits = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+        client = httpx.AsyncClient(http2=True, limits=limits)
+    
+    # Deleted/private videos come through as None; drop them before batching
+    total = valid = 0
+    def numbered():
+        nonlocal total
+        for total, entry in enumerate(entries, 1):
+            if entry:
+                yield total, entry
+    valid_entries = numbered()
+    
+    try:
+        while True:
+            batch = await loop.run_in_executor(None, list, islice(valid_entries, LIST_BATCH))
+            if not batch:
+                break
+            if client is not None:
+                await _fill_missing(client, [entry for _, entry in batch])
+            sys.stdout.write("\n".join(_format_entries(batch)) + "\n")
+            sys.stdout.flush()
+            valid += len(batch)
+    finally:
+        if client is not None:
+            await client.aclose()
+    
+    print("-" * 50)
+    print(f"Total videos: {total}")
+    print(f"Total valid: {valid}")
+
+def list_playlist_videos(playlist_url, use_cache=True):
     """
     List all videos in a playlist without downloading them
     
     Args:
         playlist_url (str): URL of the YouTube playlist
+        use_cache (bool): If False, fetch the playlist listing even if it is cached
     """
-    ydl_opts = {
-        'extract_flat': True,
-        'quiet': True,
-    }
+    import asyncio
+    
+    # On a terminal stdout flushes every line; the listing flushes once per batch instead
+    line_buffering = getattr(sys.stdout, 'line_buffering', False)
+    if line_buffering:
+        sys.stdout.reconfigure(line_buffering=False)
     
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            print(f"Fetching playlist information: {playlist_url}")
-            print("-" * 50)
-            
-            # Extract playlist info
-            playlist_info = ydl.extract_info(playlist_url, download=False)
+        print(f"Fetching playlist information: {playlist_url}")
+        print("-" * 50)
+        sys.stdout.flush()
+        
+        # Entries are printed as they arrive, the total once the listing is complete
+        asyncio.run(_list_async(playlist_url, use_cache))
             
-            if 'entries' in playlist_info:
-                print(f"Playlist: {playlist_info.get('title', 'Unknown')}")
-                print(f"Total videos: {len(playlist_info['entries'])}")
-                print("-" * 50)
-                
-                for i, entry in enumerate(playlist_info['entries'], 1):
-                    if entry:
-                        title = entry.get('title', 'Unknown title')
-                        duration = entry.get('duration', 'Unknown duration')
-                        print(f"{i:2d}. {title}")
-                        if duration != 'Unknown duration':
-                            minutes = duration // 60
-                            seconds = duration % 60
-                            print(f"    Duration: {minutes}:{seconds:02d}")
-                        print()
-            else:
-                print("No videos found in playlist or playlist is private.")
-                
     except Exception as e:
         print(f"Error fetching playlist: {e}")
+    finally:
+        sys.stdout.flush()
+        if line_buffering:
+            sys.stdout.reconfigure(line_buffering=True)
 
 def main():
+    # Common case: just a playlist URL with default options; skip argparse entirely
+    if len(sys.argv) == 2 and sys.argv[1].startswith('http'):
+        if not download_playlist(sys.argv[1]):
+            sys.exit(1)
+        return
+    
+    import argparse
     parser = argparse.ArgumentParser(description='Download videos from a YouTube playlist')
     parser.add_argument('url', help='YouTube playlist URL')
     parser.add_argument('-o', '--output', default='input', 
@@ -114,17 +550,25 @@ def main():
                        help='Download audio only (MP3)')
     parser.add_argument('-l', '--list', action='store_true',
                        help='List videos in playlist without downloading')
+    parser.add_argument('-j', '--jobs', type=int, default=4,
+                       help='Number of videos to download in parallel (default: 4)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='With --list, ignore the cached listing (kept for 24 hours)')
     
     args = parser.parse_args()
     
+    # A bare height like 720 means "best up to 720p"; anything else is a yt-dlp format
+    format_spec = f'best[height<={args.quality}]' if args.quality.isdigit() else args.quality
+    
     if args.list:
-        list_playlist_videos(args.url)
+        list_playlist_videos(args.url, not args.no_cache)
     else:
         success = download_playlist(
             args.url, 
             args.output, 
-            args.quality, 
-            args.audio_only
+            format_spec,
+            args.audio_only,
+            args.jobs
         )
         
         if not success: